@@ -4,45 +4,92 @@ Converts a list of Shai Hulud packages from:
   https://github.com/Cobenian/shai-hulud-detect/blob/main/compromised-packages.txt
 to pkg-txt format.
 (It ignores packages before the "shai-hulud" title line, which are a different incident)
+
+Pass --strict to extract packages with the original regex instead of the
+string-method parser, e.g. to check the two give the same output.
 """
 
+import argparse
 import re
 
-input_file = "compromised-packages.txt"
-output_file = "compromised-packages.pkg-txt"
-
-try:
-    with open(input_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-except FileNotFoundError:
-    print(f"Error: {input_file} not found")
-    exit()
+# Matches package@version or package:version, with an optional leading @ for scoped packages
+PACKAGE_PATTERN = re.compile(r'(@?[^@\s]+[@:][^\s,]+)')
+# Converts package:version to package@version
+COLON_TO_AT = str.maketrans(':', '@')
 
-start_collecting = False
-packages = []
 
-for line in lines:
-    line = line.strip()
+def parse_package(line):
+    """Extract package@version from a package@version or package:version line
     
-    # Start collecting after we see "shai-hulud" (case insensitive)
-    if not start_collecting and line.startswith("# SEPTEMBER 14-16, 2025 - SHAI-HULUD"):
-        start_collecting = True
-        continue
-    
-    # If we're collecting, look for package@version patterns
-    if start_collecting and line and not line.startswith('#'):
-        # Find package@version or package:version pattern in the line
-        match = re.search(r'(@?[^@\s]+[@:][^\s,]+)', line)
-        if match:
-            # Convert any : to @ for consistent output format
-            package = match.group(1).replace(':', '@')
-            packages.append(package)
-        else:
-            print(f"parse error: {line}")
-
-# Write to output file
-with open(output_file, 'w', encoding='utf-8') as f:
-    for package in packages:
-        f.write(f"{package}\n")
-
-print(f"Extracted {len(packages)} packages to {output_file}")
\ No newline at end of file
+    Like PACKAGE_PATTERN, this searches the whole line, so leading text such as
+    a list marker ("- foo@1.0") is skipped; the first word with a version wins.
+    The two only differ on malformed lines: the regex turns every ':' into '@'
+    and can take a comma into the package name.
+    """
+    for word in line.split():
+        # The version ends at the first comma
+        token = word.split(',', 1)[0]
+        # The separator is the last @ or : - a leading @ belongs to a scoped name
+        separator = max(token.rfind('@'), token.rfind(':'))
+        if separator > 0 and separator < len(token) - 1:
+            return f"{token[:separator]}@{token[separator + 1:]}"
+    return None
+
+
+def parse_package_strict(line):
+    """Extract package@version from a line using PACKAGE_PATTERN"""
+    match = PACKAGE_PATTERN.search(line)
+    if not match:
+        return None
+    # Convert any : to @ for consistent output format
+    return match.group(1).translate(COLON_TO_AT)
+
+
+def main():
+    """Convert compromised-packages.txt to compromised-packages.pkg-txt"""
+    parser = argparse.ArgumentParser(description='Convert the Shai Hulud compromised packages list to pkg-txt format')
+    parser.add_argument('--strict', action='store_true', help='Parse lines with the regex rather than string methods')
+    args = parser.parse_args()
+
+    parse = parse_package_strict if args.strict else parse_package
+
+    input_file = "compromised-packages.txt"
+    output_file = "compromised-packages.pkg-txt"
+
+    try:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        print(f"Error: {input_file} not found")
+        return
+
+    start_collecting = False
+    packages = []
+
+    for line in lines:
+        line = line.strip()
+        
+        # Start collecting after we see "shai-hulud" (case insensitive)
+        if not start_collecting and line.startswith("# SEPTEMBER 14-16, 2025 - SHAI-HULUD"):
+            start_collecting = True
+            continue
+        
+        # If we're collecting, look for package@version patterns
+        if start_collecting and line and not line.startswith('#'):
+            # Find package@version or package:version pattern in the line
+            package = parse(line)
+            if package:
+                packages.append(package)
+            else:
+                print(f"parse error: {line}")
+
+    # Write to output file
+    with open(output_file, 'w', encoding='utf-8') as f:
+        if packages:
+            f.write('\n'.join(packages) + '\n')
+
+    print(f"Extracted {len(packages)} packages to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,15 @@ import argparse
 import json
 import requests
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+PER_PAGE = 100  # Maximum per page for GitHub API
+# Number of pages fetched in parallel once the last page number is known
+PAGE_WORKERS = 8
 
 def get_github_token():
     """Get GitHub token using gh CLI"""
@@ -19,60 +27,145 @@ def get_github_token():
         print("  gh auth login")
         exit(1)
 
-def get_all_repos(owner, token):
-    """Get list of all repositories for the owner using GitHub API with pagination"""
-    repos = []
-    page = 1
-    per_page = 100  # Maximum per page for GitHub API
-    
-    headers = {
+def create_session(token):
+    """Create a requests session that reuses connections to the GitHub API"""
+    session = requests.Session()
+    # Retry transient errors with exponential backoff
+    retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                  respect_retry_after_header=True, raise_on_status=False)
+    session.mount('https://', HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=PAGE_WORKERS))
+    session.headers.update({
         'Accept': 'application/vnd.github+json',
         'Authorization': f'Bearer {token}',
         'X-GitHub-Api-Version': '2022-11-28'
+    })
+    return session
+
+def load_page_cache(cache_file):
+    """Load the ETags and repositories of previously fetched pages"""
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_page_cache(cache_file, page_cache):
+    """Save the ETags and repositories of fetched pages for the next run"""
+    with open(cache_file, 'w') as f:
+        json.dump(page_cache, f)
+
+def fetch_page(session, owner, page, cached=None):
+    """Fetch one page of the organization's repositories
+    
+    Returns the response and the page's repository summaries. If cached holds
+    the page from a previous run and it hasn't changed (304 Not Modified), the
+    cached repositories are returned.
+    """
+    url = f"https://api.github.com/orgs/{owner}/repos"
+    params = {
+        'per_page': PER_PAGE,
+        'page': page,
+        'type': 'all',
+        'sort': 'name'
     }
+    headers = {'If-None-Match': cached['etag']} if cached else {}
+    
+    print(f"Fetching page {page} of repositories...")
+    response = session.get(url, headers=headers, params=params)
+    
+    if response.status_code == 304:
+        # Page unchanged since the last run - reuse what we had
+        return response, cached['repos']
+    
+    response.raise_for_status()
     
-    while True:
-        url = f"https://api.github.com/orgs/{owner}/repos"
-        params = {
-            'per_page': per_page,
-            'page': page,
-            'type': 'all',
-            'sort': 'name'
+    # Keep all repositories with their archived status and other metadata
+    page_repos = [
+        {
+            'name': repo['name'],
+            'archived': repo['archived'],
+            'private': repo['private'],
+            'fork': repo['fork'],
+            'created_at': repo['created_at'],
+            'updated_at': repo['updated_at'],
+            'language': repo['language'],
+            'size': repo['size']
         }
-        
-        try:
-            print(f"Fetching page {page} of repositories...")
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            page_repos = response.json()
-            
-            # Keep all repositories with their archived status and other metadata
-            for repo in page_repos:
-                repos.append({
-                    'name': repo['name'],
-                    'archived': repo['archived'],
-                    'private': repo['private'],
-                    'fork': repo['fork'],
-                    'created_at': repo['created_at'],
-                    'updated_at': repo['updated_at'],
-                    'language': repo['language'],
-                    'size': repo['size']
-                })
-            
-            # Check if we've reached the end
-            if len(page_repos) < per_page:
-                break
-                
+        for repo in response.json()
+    ]
+    return response, page_repos
+
+def get_last_page(response):
+    """Get the last page number from the response's Link header, or None if it has none"""
+    last_url = response.links.get('last', {}).get('url')
+    if not last_url:
+        return None
+    pages = parse_qs(urlparse(last_url).query).get('page')
+    return int(pages[0]) if pages else None
+
+def get_all_repos(owner, session, cache_file=None):
+    """Get list of all repositories for the owner using GitHub API with pagination
+    
+    If cache_file is given, each page's ETag is remembered there so that pages
+    which haven't changed since the last run come back as 304 Not Modified.
+    
+    The first page's Link header gives the number of the last page, so the
+    remaining pages are fetched in parallel. Without it, pages are fetched one
+    at a time until a short page is returned.
+    """
+    repos = []
+    
+    page_cache = load_page_cache(cache_file) if cache_file else {}
+    new_page_cache = {}
+    
+    def add_page(page, response, page_repos):
+        repos.extend(page_repos)
+        if response.status_code == 304:
+            new_page_cache[str(page)] = page_cache[str(page)]
+        elif response.headers.get('ETag'):
+            new_page_cache[str(page)] = {'etag': response.headers['ETag'], 'repos': page_repos}
+    
+    try:
+        response, page_repos = fetch_page(session, owner, 1, page_cache.get('1'))
+    except requests.exceptions.RequestException as e:
+        # If first page fails, exit
+        print(f"Error fetching repositories (page 1): {e}")
+        exit(1)
+    add_page(1, response, page_repos)
+    
+    last_page = get_last_page(response)
+    
+    if last_page:
+        pages = range(2, last_page + 1)
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            futures = [
+                executor.submit(fetch_page, session, owner, page, page_cache.get(str(page)))
+                for page in pages
+            ]
+            for page, future in zip(pages, futures):
+                try:
+                    response, page_repos = future.result()
+                except requests.exceptions.RequestException as e:
+                    # If a later page fails, continue with the pages before it
+                    print(f"Error fetching repositories (page {page}): {e}")
+                    print(f"Continuing with {len(repos)} repositories fetched so far...")
+                    break
+                add_page(page, response, page_repos)
+    else:
+        page = 1
+        while len(page_repos) == PER_PAGE:
             page += 1
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching repositories (page {page}): {e}")
-            if page == 1:  # If first page fails, exit
-                exit(1)
-            else:  # If later page fails, continue with what we have
+            try:
+                response, page_repos = fetch_page(session, owner, page, page_cache.get(str(page)))
+            except requests.exceptions.RequestException as e:
+                # If a later page fails, continue with what we have
+                print(f"Error fetching repositories (page {page}): {e}")
                 print(f"Continuing with {len(repos)} repositories fetched so far...")
                 break
+            add_page(page, response, page_repos)
+    
+    if cache_file:
+        save_page_cache(cache_file, new_page_cache)
     
     return repos
 
@@ -101,14 +194,17 @@ def main():
     
     # Get GitHub token
     token = get_github_token()
+    session = create_session(token)
+    
+    output_file = f"repos_{owner}.json"
+    cache_file = f"repos_{owner}.etags.json"
     
     # Get list of all repositories with pagination
     print(f"Fetching all repositories for {owner}...")
-    all_repos = get_all_repos(owner, token)
+    all_repos = get_all_repos(owner, session, cache_file)
     total_repos = len(all_repos)
     
     # Save to JSON file
-    output_file = f"repos_{owner}.json"
     repo_data = {
         'organization': owner,
         'total_count': total_repos,
@@ -1,13 +1,45 @@
 #!/usr/bin/env python3
 
 import argparse
+import gzip
 import json
+import os
 import requests
+import urllib3
 import subprocess
 import tempfile
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard library json
+    orjson = None
+
+# Default number of SBOMs fetched from the GitHub API in parallel
+DEFAULT_WORKERS = 16
+# Back off when fewer than this many API requests remain in the rate limit window
+RATE_LIMIT_THRESHOLD = 50
+
+rate_limit_lock = threading.Lock()
+
+def _dumps(data):
+    """Serialize data to indented JSON bytes, using orjson if it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+def _loads(data):
+    """Parse JSON from bytes or str, using orjson if it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 def get_github_token():
     """Get GitHub token using gh CLI"""
@@ -34,8 +66,8 @@ def check_syft_installed():
 def load_repo_data(filename):
     """Load repository data from JSON file"""
     try:
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            data = _loads(f.read())
         return data
     except FileNotFoundError:
         print(f"Error: Repository file '{filename}' not found")
@@ -45,33 +77,85 @@ def load_repo_data(filename):
         print(f"Error parsing JSON file '{filename}': {e}")
         exit(1)
 
-def fetch_sbom(owner, repo, token):
-    """Fetch SBOM data for a repository"""
-    url = f"https://api.github.com/repos/{owner}/{repo}/dependency-graph/sbom"
-    
-    headers = {
+def create_session(token, pool_maxsize=32):
+    """Create a requests session that reuses connections to the GitHub API"""
+    session = requests.Session()
+    # Retry transient errors with exponential backoff. 500 is left out because
+    # GitHub returns it when SBOM generation times out, which fetch_sbom
+    # handles by falling back to syft.
+    retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504],
+                  respect_retry_after_header=True, raise_on_status=False)
+    session.mount('https://', HTTPAdapter(max_retries=retry, pool_connections=16, pool_maxsize=pool_maxsize))
+    session.headers.update({
         'Accept': 'application/vnd.github+json',
+        # SBOMs are large JSON documents that compress 5-10x
+        'Accept-Encoding': 'gzip, deflate',
         'Authorization': f'Bearer {token}',
         'X-GitHub-Api-Version': '2022-11-28'
-    }
+    })
+    return session
+
+def wait_for_rate_limit(response):
+    """Sleep until the rate limit resets if we are close to exhausting it"""
+    remaining = response.headers.get('X-RateLimit-Remaining')
+    reset = response.headers.get('X-RateLimit-Reset')
+    if remaining is None or reset is None or int(remaining) > RATE_LIMIT_THRESHOLD:
+        return
     
+    # Only one thread sleeps; the others queue up behind it and then carry on
+    with rate_limit_lock:
+        delay = int(reset) - time.time()
+        if delay > 0:
+            print(f"  → Rate limit nearly exhausted ({remaining} remaining), waiting {int(delay)}s...")
+            time.sleep(delay + 1)
+
+def _is_timeout_error(response):
+    """Check whether an error response says GitHub timed out generating the SBOM"""
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        return data.get('sbom', {}), None
-    except requests.exceptions.RequestException as e:
-        # Check if this is a timeout error
-        try:
-            if response.status_code == 500:
-                error_data = response.json()
-                if "timed out" in error_data.get("message", "").lower():
-                    return None, "timeout"
-        except:
-            pass
-        
+        error_data = response.json()
+    except ValueError:
+        return False
+    return isinstance(error_data, dict) and "timed out" in str(error_data.get("message", "")).lower()
+
+def fetch_sbom(owner, repo, session, output_file):
+    """Fetch SBOM data for a repository and save it to output_file
+    
+    The response body is streamed straight to disk, still wrapped in the API's
+    {"sbom": ...} object, which scan.py understands. It is written to a .part
+    file first so an interrupted download never looks like a complete SBOM.
+    
+    If output_file ends in .gz the SBOM is saved gzipped. When GitHub sent the
+    body gzipped, the compressed bytes are saved as they arrived.
+    """
+    url = f"https://api.github.com/repos/{owner}/{repo}/dependency-graph/sbom"
+    temp_file = output_file.with_name(output_file.name + '.part')
+    
+    try:
+        with session.get(url, stream=True) as response:
+            wait_for_rate_limit(response)
+            # Check if this is a timeout error, while the body can still be read
+            if response.status_code == 500 and _is_timeout_error(response):
+                return False, "timeout"
+            response.raise_for_status()
+            
+            compress = output_file.suffix == '.gz'
+            if compress and response.headers.get('Content-Encoding') == 'gzip':
+                chunks = response.raw.stream(65536, decode_content=False)
+                opener = open
+            else:
+                # iter_content undoes any Content-Encoding
+                chunks = response.iter_content(chunk_size=65536)
+                opener = gzip.open if compress else open
+            
+            with opener(temp_file, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        os.replace(temp_file, output_file)
+        return True, None
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        temp_file.unlink(missing_ok=True)
         print(f"Error fetching SBOM for {repo}: {e}")
-        return None, "error"
+        return False, "error"
 
 def clone_and_generate_sbom_with_syft(owner, repo, output_file):
     """Clone repository and generate SBOM using syft"""
@@ -95,11 +179,12 @@ def clone_and_generate_sbom_with_syft(owner, repo, output_file):
             ], capture_output=True, text=True, check=True)
             
             # Parse the syft output
-            sbom_data = json.loads(syft_result.stdout)
+            sbom_data = _loads(syft_result.stdout)
             
             # Save to file
-            with open(output_file, 'w') as f:
-                json.dump(sbom_data, f, indent=2)
+            opener = gzip.open if output_file.suffix == '.gz' else open
+            with opener(output_file, 'wb') as f:
+                f.write(_dumps(sbom_data))
             
             print(f"  ✓ Generated local SBOM and saved to {output_file}")
             return True
@@ -119,7 +204,7 @@ def clone_and_generate_sbom_with_syft(owner, repo, output_file):
             print(f"  ✗ Unexpected error during local SBOM generation: {e}")
             return False
 
-def main(repo_file, syft_mode):
+def main(repo_file, syft_mode, workers=DEFAULT_WORKERS, compress=False):
     # Setup
     sbom_dir = Path('sbom-data')
     sbom_dir.mkdir(exist_ok=True)
@@ -159,6 +244,8 @@ def main(repo_file, syft_mode):
     
     # Get GitHub token
     token = get_github_token()
+    # Keep at least one pooled connection per worker so none are thrown away
+    session = create_session(token, pool_maxsize=max(32, workers))
     
     # Initialize counters
     archived_count = 0
@@ -168,52 +255,67 @@ def main(repo_file, syft_mode):
     timeout_success_count = 0
     timeout_error_count = 0
     
-    # Process each repository
-    processed = 0
+    # List the SBOM directory once rather than checking each file exists
+    existing_files = {entry.name for entry in os.scandir(sbom_dir)}
+    
+    # Work out which repositories need an SBOM fetching
+    todo = []
     for repo_info in all_repos:
         repo_name = repo_info['name']
         repo_owner = repo_info.get('owner', owner)  # Use organization as fallback
-        is_archived = repo_info['archived']
-        processed += 1
-        
-        print(f"[{processed}/{total_repos}] Processing {repo_owner}/{repo_name}...")
         
         # Skip archived repositories
-        if is_archived:
+        if repo_info['archived']:
             print(f"  → Skipping {repo_name} - archived repository")
             archived_count += 1
             continue
         
-        filename = sbom_dir / f"{today}_sbom_{repo_name}.json"
+        sbom_name = f"{today}_sbom_{repo_name}.json"
         
-        # Check if file already exists
-        if filename.exists():
+        # Check if file already exists, compressed or not
+        if sbom_name in existing_files or f"{sbom_name}.gz" in existing_files:
             print(f"  → Skipping {repo_name} - SBOM file already exists")
             skipped_count += 1
             continue
         
-        # Try to fetch SBOM from GitHub API
-        sbom_data, error_type = fetch_sbom(repo_owner, repo_name, token)
+        if compress:
+            sbom_name += '.gz'
+        todo.append((repo_owner, repo_name, sbom_dir / sbom_name))
+    
+    print(f"Fetching {len(todo)} SBOMs using {workers} workers...")
+    
+    # Fetch SBOMs concurrently. Results are handled (and counters updated) on
+    # this thread only, so the syft fallback also runs one repo at a time.
+    processed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(fetch_sbom, repo_owner, repo_name, session, filename): (repo_owner, repo_name, filename)
+            for repo_owner, repo_name, filename in todo
+        }
         
-        if sbom_data is not None:
-            # Success - save the SBOM
-            with open(filename, 'w') as f:
-                json.dump(sbom_data, f, indent=2)
-            print(f"  ✓ Saved GitHub SBOM to {filename}")
-            success_count += 1
-        elif error_type == "timeout" and use_syft:
-            # Timeout error - try local generation
-            print(f"  → GitHub SBOM generation timed out, trying local generation...")
-            if clone_and_generate_sbom_with_syft(repo_owner, repo_name, filename):
-                timeout_success_count += 1
-            else:
+        for future in as_completed(futures):
+            repo_owner, repo_name, filename = futures[future]
+            saved, error_type = future.result()
+            processed += 1
+            
+            print(f"[{processed}/{len(todo)}] Processed {repo_owner}/{repo_name}")
+            
+            if saved:
+                print(f"  ✓ Saved GitHub SBOM to {filename}")
+                success_count += 1
+            elif error_type == "timeout" and use_syft:
+                # Timeout error - try local generation
+                print(f"  → GitHub SBOM generation timed out, trying local generation...")
+                if clone_and_generate_sbom_with_syft(repo_owner, repo_name, filename):
+                    timeout_success_count += 1
+                else:
+                    timeout_error_count += 1
+            elif error_type == "timeout" and not use_syft:
+                print(f"  ✗ GitHub SBOM generation timed out for {repo_name} (syft not enabled)")
                 timeout_error_count += 1
-        elif error_type == "timeout" and not use_syft:
-            print(f"  ✗ GitHub SBOM generation timed out for {repo_name} (syft not enabled)")
-            timeout_error_count += 1
-        else:
-            print(f"  ✗ Failed to fetch SBOM for {repo_name}")
-            error_count += 1
+            else:
+                print(f"  ✗ Failed to fetch SBOM for {repo_name}")
+                error_count += 1
     
     # Summary
     print(f'\n=== SBOM Collection Summary ===')
@@ -235,6 +337,8 @@ if __name__ == "__main__":
         epilog='''Examples:
   python3 github_sbom_fetcher.py                              # Use defaults
   python3 github_sbom_fetcher.py --syft disabled              # Disable syft
+  python3 github_sbom_fetcher.py --workers 4                  # Fewer parallel fetches
+  python3 github_sbom_fetcher.py --compress                   # Save gzipped SBOMs
   python3 github_sbom_fetcher.py repos_alphagov.json          # Custom repo file'''
     )
     
@@ -252,6 +356,19 @@ if __name__ == "__main__":
         help='Control syft usage for timeout errors: enabled (require syft), disabled (never use), if-installed (use if available) (default: if-installed)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Number of SBOMs to fetch from GitHub in parallel (default: {DEFAULT_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--compress',
+        action='store_true',
+        help='Save SBOMs gzipped, as .json.gz files (scan.py reads these directly)'
+    )
+    
     args = parser.parse_args()
     
-    main(args.repo_file, args.syft)
\ No newline at end of file
+    main(args.repo_file, args.syft, args.workers, args.compress)
\ No newline at end of file
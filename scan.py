@@ -8,29 +8,114 @@ Scans Software Bill of Materials (SBOM) files for compromised packages.
 import json
 import glob
 import argparse
+import gzip
+import hashlib
+import io
+import os
+import re
 import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Set, Dict, List, Tuple
+from typing import FrozenSet, Dict, List, Tuple, Iterable, Iterator, BinaryIO, Optional
 
+try:
+    import ijson
+except ImportError:  # fall back to loading whole files
+    ijson = None
 
-def load_compromised_packages(file_path: str) -> Set[str]:
+try:
+    import orjson
+except ImportError:  # fall back to the standard library json
+    orjson = None
+
+
+# (name, version) fields of each entry in the list-of-components SBOM formats
+COMPONENT_FIELDS = {
+    'packages': ('name', 'versionInfo'),  # SPDX
+    'components': ('name', 'version'),    # CycloneDX
+    'artifacts': ('name', 'version'),     # GitHub dependency format
+}
+
+# Top-level keys that hold the package list, in order of preference
+SBOM_FORMATS = (*COMPONENT_FIELDS, 'manifests')
+
+# SBOM files larger than this (uncompressed) are streamed with ijson (if installed); smaller
+# files are quicker to load whole with orjson
+STREAMING_THRESHOLD = 4 * 1024 * 1024
+
+# Package URL as used in Syft manifests: pkg:type/name@version#fragment, where
+# name may include a namespace (e.g. pkg:github/actions/checkout@v2 or
+# pkg:npm/@scope/package@1.0.0). The name runs up to the last '@'.
+PACKAGE_URL_PATTERN = re.compile(r'pkg:(?:[^/]*/)?(.*)@([^#]*)')
+
+# Compromised package versions, keyed by package name
+CompromisedPackages = Dict[str, FrozenSet[str]]
+
+# Directory where scan results are cached, keyed by SBOM file, compromised list
+# and the scanner's own source
+DEFAULT_CACHE_DIR = '.scan-cache'
+
+# orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+JSON_ERRORS = (json.JSONDecodeError,) if ijson is None else (json.JSONDecodeError, ijson.JSONError)
+
+
+def _loads(data: bytes):
+    """
+    Parse JSON bytes, using orjson if it is installed.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=16)
+def _load_compromised_packages_impl(file_path: str, mtime_ns: int, size: int) -> CompromisedPackages:
+    """
+    Parse a compromised packages file.
+    
+    The modification time and size aren't used here, they are part of the
+    cache key so that a file which has changed since it was last loaded is
+    parsed again.
+    """
+    # Read and decode the whole file in one go and split it in C, rather
+    # than iterating over a text-mode file or decoding line by line
+    packages = defaultdict(set)
+    for raw_line in Path(file_path).read_bytes().decode('utf-8').splitlines():
+        raw_line = raw_line.strip()
+        if raw_line and not raw_line.startswith('#'):  # Skip empty lines and comments
+            name, _, version = raw_line.rpartition('@')
+            if name and version:  # Skip lines without a version
+                packages[sys.intern(name)].add(sys.intern(version))
+    return {name: frozenset(versions) for name, versions in packages.items()}
+
+
+def load_compromised_packages(file_path: str) -> CompromisedPackages:
     """
     Load list of compromised packages from a text file.
     
+    Each line is in format "package@version" / "@scope/package@version". It is
+    split on the last '@', so the '@' at the start of a scoped name is kept.
+    Names and versions are interned, like those parsed from SBOMs, so matching
+    strings are usually the same object.
+    
+    The versions are grouped by name, so that the many SBOM packages whose
+    name isn't compromised at all are ruled out by a single dict lookup.
+    
+    Parsed files are cached on their path, modification time and size, so
+    loading the same unchanged file again returns the same dict without
+    re-reading it. Callers share that dict and must not modify it.
+    
     Args:
         file_path: Path to the compromised packages file
         
     Returns:
-        Set of compromised package strings in format "package@version" / "@scope/package@version"
+        Dict mapping each compromised package name to its compromised versions
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            packages = set()
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):  # Skip empty lines and comments
-                    packages.add(line)
-            return packages
+        stat = os.stat(file_path)
+        return _load_compromised_packages_impl(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
     except FileNotFoundError:
         print(f"Error: Compromised packages file '{file_path}' not found.")
         sys.exit(1)
@@ -39,129 +124,439 @@ def load_compromised_packages(file_path: str) -> Set[str]:
         sys.exit(1)
 
 
-def parse_sbom_file(file_path: str) -> List[Dict]:
+def _component_fields(format_key: str, components: Iterable[Dict]) -> Iterator[Tuple[object, object]]:
+    """
+    Yield the raw name and version of each component in an SPDX ('packages'),
+    CycloneDX ('components') or GitHub dependency ('artifacts') list.
+    """
+    # Look the field names up once per file rather than branching per component
+    name_key, version_key = COMPONENT_FIELDS[format_key]
+    return ((component.get(name_key, ''), component.get(version_key, '')) for component in components)
+
+
+def _component_packages(pairs: Iterable[Tuple[object, object]]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield packages from raw component names and versions, skipping any
+    without both.
+    """
+    # Interned, so the many repeats of a name share one string object; str()
+    # covers versions given as JSON numbers
+    return (
+        (sys.intern(str(name)), sys.intern(str(version)))
+        for name, version in pairs if name and version
+    )
+
+
+def _manifest_packages(package_urls: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield packages from the package URLs resolved in Syft manifests.
+    """
+    for package_url in package_urls:
+        # Scoped npm names are percent-encoded in package URLs (%40scope/package)
+        match = PACKAGE_URL_PATTERN.match(package_url.replace('%40', '@'))
+        if match:
+            name, version = match.groups()
+            if name and version:
+                yield sys.intern(name), sys.intern(version)
+
+
+def _sbom_format(f: BinaryIO) -> Tuple[str, Optional[str]]:
+    """
+    Find which SBOM format key to read from a JSON document, without
+    building it in memory, following the same rules as _sbom_data_format.
+    
+    Parsing stops at the first format key in the top-level object. A format
+    key in the 'sbom' object is only used once the top-level object has
+    ended without one, so wrapped documents are read to the end.
+    
+    Returns:
+        Tuple of (prefix, format key), e.g. ('sbom.', 'packages'), with a
+        format key of None if the document has none
+    """
+    wrapped_format_key = None
+    for prefix, event, value in ijson.parse(f):
+        if event == 'map_key' and value in SBOM_FORMATS:
+            if prefix == '':
+                return '', value
+            if prefix == 'sbom' and wrapped_format_key is None:
+                wrapped_format_key = value
+    if wrapped_format_key is not None:
+        return 'sbom.', wrapped_format_key
+    return '', None
+
+
+def _sbom_data_format(sbom_data: Dict) -> Tuple[Dict, Optional[str]]:
+    """
+    Find which SBOM format key to read from a loaded JSON document.
+    
+    The first format key in the top-level object is used. Failing that, the
+    first in its 'sbom' object, as in the GitHub API responses saved by
+    sbom_fetcher.py.
+    
+    Returns:
+        Tuple of (object holding the format key, format key), with a format
+        key of None if the document has none
+    """
+    format_key = next((key for key in sbom_data if key in SBOM_FORMATS), None)
+    if format_key is None and isinstance(sbom_data.get('sbom'), dict):
+        sbom_data = sbom_data['sbom']
+        format_key = next((key for key in sbom_data if key in SBOM_FORMATS), None)
+    return sbom_data, format_key
+
+
+def _file_size(f: BinaryIO) -> Optional[int]:
+    """
+    Get the size of an open file's contents, or None if it isn't known.
+    
+    For gzipped files this is the uncompressed size, from the 4-byte trailer
+    at the end of the file. fileno() is the compressed file's, so its size
+    on disk would make a large SBOM look small.
+    """
+    try:
+        size = os.fstat(f.fileno()).st_size
+        if isinstance(f, gzip.GzipFile):
+            # The trailer holds the size modulo 2**32 (and, for a multi-member
+            # file, only the last member's). A wrong guess only picks the
+            # slower way of parsing, but a file that large should stream
+            if size < 4 or size >= 2 ** 32:
+                return None
+            # pread leaves the file position alone
+            return int.from_bytes(os.pread(f.fileno(), 4, size - 4), 'little')
+        return size
+    except (AttributeError, io.UnsupportedOperation, OSError):
+        return None
+
+
+def iter_sbom_packages(f: BinaryIO) -> Iterator[Tuple[str, str]]:
+    """
+    Yield package information from an open SBOM file, one package at a time.
+    
+    Large files are streamed with ijson, if it is installed, so only one
+    component is held in memory at once. Other files are loaded whole, with
+    orjson if it is installed, which is several times faster than streaming.
+    
+    SBOMs saved by sbom_fetcher.py are the GitHub API response as-is, with the
+    SBOM document wrapped in an 'sbom' key; these are unwrapped.
+    
+    Args:
+        f: SBOM JSON file opened in binary mode
+        
+    Returns:
+        Iterator of (package_name, version) tuples
+    """
+    # Handle different SBOM formats (SPDX, CycloneDX, GitHub, Syft)
+    size = _file_size(f)
+    if ijson is not None and (size is None or size > STREAMING_THRESHOLD):
+        prefix, format_key = _sbom_format(f)
+        f.seek(0)
+        if format_key == 'manifests':
+            # One manifest is built at a time; its package URLs are the keys of its 'resolved' map
+            items = (
+                package_url
+                for _, manifest_data in ijson.kvitems(f, f'{prefix}manifests')
+                for package_url in manifest_data.get('resolved', {})
+            )
+        elif format_key is not None:
+            items = _component_fields(format_key, ijson.items(f, f'{prefix}{format_key}.item'))
+    else:
+        sbom_data, format_key = _sbom_data_format(_loads(f.read()))
+        if format_key == 'manifests':
+            items = (
+                package_url
+                for manifest_data in sbom_data['manifests'].values()
+                for package_url in manifest_data.get('resolved', {})
+            )
+        elif format_key is not None:
+            items = _component_fields(format_key, sbom_data[format_key])
+    
+    if format_key == 'manifests':
+        yield from _manifest_packages(items)
+    elif format_key is not None:
+        yield from _component_packages(items)
+
+
+def _open_sbom(file_path: str) -> BinaryIO:
+    """
+    Open an SBOM file for reading in binary mode, decompressing .gz files.
+    """
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, 'rb')
+    return open(file_path, 'rb')
+
+
+def _sbom_error_message(file_path: str, error: Exception) -> str:
+    """
+    Describe an error raised while reading an SBOM file.
+    """
+    if isinstance(error, JSON_ERRORS):
+        return f"Error parsing JSON file '{file_path}': {error}"
+    if isinstance(error, FileNotFoundError):
+        return f"Error: SBOM file '{file_path}' not found."
+    return f"Error reading SBOM file '{file_path}': {error}"
+
+
+def parse_sbom_file(file_path: str) -> List[Tuple[str, str]]:
     """
     Parse an SBOM JSON file and extract package information.
     
     Args:
-        file_path: Path to the SBOM JSON file
+        file_path: Path to the SBOM JSON file (optionally gzipped, ending .gz)
         
     Returns:
-        List of package dictionaries with name and version info
+        List of (package_name, version) tuples
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            sbom_data = json.load(f)
-        
-        packages = []
-        
-        # Handle different SBOM formats (SPDX, CycloneDX, GitHub, Syft)
-        if 'packages' in sbom_data:
-            # SPDX format
-            for pkg in sbom_data['packages']:
-                name = pkg.get('name', '')
-                version = pkg.get('versionInfo', '')
-                if name and version:
-                    packages.append({'name': name, 'version': version})
-        
-        elif 'components' in sbom_data:
-            # CycloneDX format
-            for component in sbom_data['components']:
-                name = component.get('name', '')
-                version = component.get('version', '')
-                if name and version:
-                    packages.append({'name': name, 'version': version})
-        
-        elif 'artifacts' in sbom_data:
-            # GitHub dependency format
-            for artifact in sbom_data['artifacts']:
-                name = artifact.get('name', '')
-                version = artifact.get('version', '')
-                if name and version:
-                    packages.append({'name': name, 'version': version})
-        
-        elif 'manifests' in sbom_data:
-            # Syft format with manifests
-            for manifest_path, manifest_data in sbom_data['manifests'].items():
-                if 'resolved' in manifest_data:
-                    for package_url, package_info in manifest_data['resolved'].items():
-                        # Parse package URL format: pkg:github/package@version
-                        # or other formats like pkg:npm/package@version
-                        if package_url.startswith('pkg:'):
-                            try:
-                                # Split the package URL to extract name and version
-                                # Format: pkg:type/namespace/name@version or pkg:type/name@version
-                                url_parts = package_url.split(':', 1)[1]  # Remove 'pkg:'
-                                
-                                if '@' in url_parts:
-                                    name_part, version = url_parts.rsplit('@', 1)
-                                    # Remove the type prefix (github/, npm/, etc.)
-                                    if '/' in name_part:
-                                        # Handle cases like "github/actions/checkout" or "npm/@scope/package"
-                                        type_and_name = name_part.split('/', 1)[1]  # Remove type
-                                        name = type_and_name
-                                    else:
-                                        name = name_part
-                                    
-                                    # Clean up version if it contains fragments (e.g., @main#node/matrix)
-                                    if '#' in version:
-                                        version = version.split('#')[0]
-                                    
-                                    if name and version:
-                                        packages.append({'name': name, 'version': version})
-                            except (ValueError, IndexError) as e:
-                                # Skip malformed package URLs
-                                print(f"  Warning: Could not parse package URL '{package_url}': {e}")
-                                continue
-        
-        return packages
-        
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON file '{file_path}': {e}")
-        return []
-    except FileNotFoundError:
-        print(f"Error: SBOM file '{file_path}' not found.")
-        return []
+        with _open_sbom(file_path) as f:
+            return list(iter_sbom_packages(f))
     except Exception as e:
-        print(f"Error reading SBOM file '{file_path}': {e}")
+        print(_sbom_error_message(file_path, e))
         return []
 
 
-def compare_packages_in_sbom_to_compromised_packages(packages: List[Dict], compromised: Set[str]) -> List[Tuple[str, str]]:
+def _counted(packages: Iterable[Tuple[str, str]], counts: List[int]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield packages unchanged, counting them in counts[0] as they go by.
+    """
+    for package in packages:
+        counts[0] += 1
+        yield package
+
+
+def _scan_sbom_file(file_path: str, compromised: CompromisedPackages) -> Tuple[int, List[Tuple[str, str]], Optional[str]]:
+    """
+    Count and match the packages in an SBOM file, returning any error message
+    rather than printing it.
+    """
+    counts = [0]
+    
+    try:
+        with _open_sbom(file_path) as f:
+            packages = _counted(iter_sbom_packages(f), counts)
+            found_compromised = compare_packages_in_sbom_to_compromised_packages(packages, compromised)
+    except Exception as e:
+        return 0, [], _sbom_error_message(file_path, e)
+    
+    return counts[0], found_compromised, None
+
+
+def scan_sbom_file(file_path: str, compromised: CompromisedPackages) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Count the packages in an SBOM file and find any that are compromised.
+    
+    Parsing and matching happen in a single pass over the file, so the
+    packages are never collected into a list.
+    
+    Args:
+        file_path: Path to the SBOM JSON file
+        compromised: Compromised versions by package name
+        
+    Returns:
+        Tuple of (number of packages, list of (package_name, version) matches).
+        Files that can't be read count as having no packages.
+    """
+    package_count, found_compromised, error = _scan_sbom_file(file_path, compromised)
+    if error:
+        print(error)
+    return package_count, found_compromised
+
+
+def compare_packages_in_sbom_to_compromised_packages(packages: Iterable[Tuple[str, str]], compromised: CompromisedPackages) -> List[Tuple[str, str]]:
     """
     Check if any packages match the compromised packages list.
     Handles both regular packages (package@version) and scoped packages (@scope/package@version).
     
+    The packages can come straight from iter_sbom_packages, so that they are
+    matched as they are parsed without being collected into a list first.
+    
     Args:
-        packages: List of package dictionaries from SBOM
-        compromised: Set of compromised package strings
+        packages: (package_name, version) tuples from SBOM
+        compromised: Compromised versions by package name
         
     Returns:
         List of tuples containing (package_name, version) for matches
     """
     found_compromised = []
     
-    for pkg in packages:
-        name = pkg['name']
-        version = pkg['version']
-        package_string = f"{name}@{version}"
-        
-        if package_string in compromised:
+    for name, version in packages:
+        versions = compromised.get(name)
+        if versions is not None and version in versions:
             found_compromised.append((name, version))
     
     return found_compromised
 
 
-def scan_sbom_files(sbom_pattern: str, compromised_file: str) -> None:
+def _file_sha256(file_path: str) -> str:
+    """
+    Get the SHA-256 hex digest of a file's contents.
+    """
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+        return digest.hexdigest()
+
+
+def _compromised_sha256(compromised: CompromisedPackages) -> str:
+    """
+    Get a SHA-256 hex digest identifying a set of compromised packages.
+    """
+    lines = sorted(f"{name}@{version}" for name, versions in compromised.items() for version in versions)
+    return hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _scanner_sha256() -> str:
+    """
+    Get a SHA-256 hex digest of this script, so that cached results are not
+    reused after the parsing or matching code changes.
+    """
+    return _file_sha256(__file__)
+
+
+# State for the current worker process, set once by _init_worker so that the
+# compromised packages aren't pickled and sent along with every SBOM file
+_worker_compromised: CompromisedPackages = {}
+_worker_compromised_sha256 = ''
+_worker_cache_dir: Optional[str] = None
+
+
+def _init_worker(compromised: CompromisedPackages, compromised_sha256: str, cache_dir: Optional[str]) -> None:
+    """
+    Store the compromised packages and cache settings in a scanning worker process.
+    """
+    global _worker_compromised, _worker_compromised_sha256, _worker_cache_dir
+    _worker_compromised = compromised
+    _worker_compromised_sha256 = compromised_sha256
+    _worker_cache_dir = cache_dir
+
+
+def _format_scan_result(sbom_file: str, package_count: int, compromised_found: List[Tuple[str, str]], error: Optional[str] = None) -> str:
+    """
+    Format the report for one scanned SBOM file.
+    """
+    lines = [f"Scanning: {sbom_file}"]
+    if error:
+        lines.append(error)
+    
+    if not package_count:
+        lines.append(f"  ⚠️  No packages found or file could not be parsed")
+        return '\n'.join(lines) + '\n'
+    
+    lines.append(f"  📦 Packages in SBOM: {package_count}")
+    
+    if compromised_found:
+        lines.append(f"  🚨 COMPROMISED PACKAGES FOUND ({len(compromised_found)}):")
+        lines.extend(f"    - {name}@{version}" for name, version in compromised_found)
+    else:
+        lines.append(f"  ✅ No compromised packages found")
+    
+    return '\n'.join(lines) + '\n\n'
+
+
+def _read_cached_result(cache_file: Path) -> Optional[Tuple[int, List[Tuple[str, str]]]]:
+    """
+    Read a cached scan result, or None if there isn't a usable one.
+    
+    An unreadable or corrupt entry is treated as missing, so the file is
+    scanned again rather than the whole scan failing.
+    """
+    try:
+        cached = _loads(cache_file.read_bytes())
+        return int(cached['packages']), [(name, version) for name, version in cached['compromised']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cached_result(cache_file: Path, package_count: int, compromised_found: List[Tuple[str, str]]) -> None:
+    """
+    Cache a scan result, written atomically so other workers never read half an entry.
+    
+    Failing to write the cache (e.g. a read-only directory) doesn't fail the scan.
+    """
+    result = {'packages': package_count, 'compromised': compromised_found}
+    temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        temp_file.write_text(json.dumps(result), encoding='utf-8')
+        os.replace(temp_file, cache_file)
+    except OSError:
+        temp_file.unlink(missing_ok=True)
+
+
+def _scan_one(sbom_file: str) -> Tuple[str, int, int]:
+    """
+    Scan one SBOM file in a worker process.
+    
+    If caching is enabled, a previous result for the same file contents,
+    compromised packages and version of this script is reused instead of
+    parsing the file again.
+    
+    Returns:
+        Tuple of (formatted report, number of packages, number of compromised packages)
+    """
+    cache_file = None
+    if _worker_cache_dir is not None:
+        try:
+            cache_key = f"{_file_sha256(sbom_file)}-{_worker_compromised_sha256}-{_scanner_sha256()}"
+        except OSError:
+            pass  # Scanned uncached, so the error is reported below
+        else:
+            cache_file = Path(_worker_cache_dir) / f"{cache_key}.json"
+            cached = _read_cached_result(cache_file)
+            if cached is not None:
+                package_count, compromised_found = cached
+                report = _format_scan_result(sbom_file, package_count, compromised_found)
+                return report, package_count, len(compromised_found)
+    
+    package_count, compromised_found, error = _scan_sbom_file(sbom_file, _worker_compromised)
+    
+    # Files that couldn't be parsed aren't cached, so their errors are reported every run
+    if cache_file is not None and package_count:
+        _write_cached_result(cache_file, package_count, compromised_found)
+    
+    report = _format_scan_result(sbom_file, package_count, compromised_found, error)
+    return report, package_count, len(compromised_found)
+
+
+def _scan_file_in_worker(sbom_file: str) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Scan one SBOM file against the worker's compromised packages.
+    """
+    return scan_sbom_file(sbom_file, _worker_compromised)
+
+
+def scan_many(sbom_paths: Iterable[str], compromised: CompromisedPackages,
+              max_workers: Optional[int] = None) -> List[Tuple[int, List[Tuple[str, str]]]]:
+    """
+    Scan many SBOM files in parallel, one process per CPU by default.
+    
+    Args:
+        sbom_paths: Paths to the SBOM JSON files
+        compromised: Compromised versions by package name
+        max_workers: Number of worker processes (default: number of CPUs)
+        
+    Returns:
+        List of (number of packages, list of (package_name, version) matches),
+        in the same order as sbom_paths
+    """
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(compromised, '', None)) as executor:
+        return list(executor.map(_scan_file_in_worker, sbom_paths, chunksize=8))
+
+
+def scan_sbom_files(sbom_pattern: str, compromised_file: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> None:
     """
     Scan SBOM files for compromised packages.
     
     Args:
         sbom_pattern: Glob pattern for SBOM files
         compromised_file: Path to compromised packages file
+        cache_dir: Directory to cache results in, or None to disable caching
     """
     # Load compromised packages
     compromised_packages = load_compromised_packages(compromised_file)
+    compromised_version_count = sum(len(versions) for versions in compromised_packages.values())
     
     # Find SBOM files
     sbom_files = glob.glob(sbom_pattern)
@@ -174,7 +569,7 @@ def scan_sbom_files(sbom_pattern: str, compromised_file: str) -> None:
     print("SBOM PACKAGE SCANNER")
     print("=" * 60)
     print(f"Compromised packages file: {compromised_file}")
-    print(f"Package versions in compromised file: {len(compromised_packages)}")
+    print(f"Package versions in compromised file: {compromised_version_count}")
     print(f"SBOM files (repos) scanned: {len(sbom_files)}")
     print("=" * 60)
     print()
@@ -183,38 +578,36 @@ def scan_sbom_files(sbom_pattern: str, compromised_file: str) -> None:
     total_packages = 0
     files_with_compromised = 0
     
-    for sbom_file in sorted(sbom_files):
-        print(f"Scanning: {sbom_file}")
-        
-        # Parse SBOM file
-        packages = parse_sbom_file(sbom_file)
-        if not packages:
-            print(f"  ⚠️  No packages found or file could not be parsed")
-            continue
-        
-        total_packages += len(packages)
-        print(f"  📦 Packages in SBOM: {len(packages)}")
-        
-        # Check for compromised packages
-        compromised_found = compare_packages_in_sbom_to_compromised_packages(packages, compromised_packages)
-        
-        if compromised_found:
-            files_with_compromised += 1
-            total_compromised += len(compromised_found)
-            print(f"  🚨 COMPROMISED PACKAGES FOUND ({len(compromised_found)}):")
-            for name, version in compromised_found:
-                print(f"    - {name}@{version}")
-        else:
-            print(f"  ✅ No compromised packages found")
+    # Parse and check SBOM files in parallel; map() returns results in the
+    # sorted order so the report reads the same as a serial scan
+    if cache_dir is not None:
+        try:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"Warning: not caching scan results, could not create '{cache_dir}': {e}")
+            print()
+            cache_dir = None
+    
+    init_args = (compromised_packages, _compromised_sha256(compromised_packages), cache_dir)
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=init_args) as executor:
+        results = executor.map(_scan_one, sorted(sbom_files), chunksize=8)
         
-        print()
+        # Workers return each file's report ready formatted, so it is
+        # written out in one go rather than a line at a time
+        for report, package_count, compromised_count in results:
+            sys.stdout.write(report)
+            
+            total_packages += package_count
+            if compromised_count:
+                files_with_compromised += 1
+                total_compromised += compromised_count
     
     # Summary section - display total packages
     print("=" * 60)
     print("SCAN RESULTS SUMMARY")
     print("=" * 60)
     print(f"Compromised packages file: {compromised_file}")
-    print(f"Package versions in compromised file: {len(compromised_packages)}")
+    print(f"Package versions in compromised file: {compromised_version_count}")
     print(f"SBOM files (repos) scanned: {len(sbom_files)}")
     print(f"Total packages in SBOMs: {total_packages}")
     print(f"Files with compromised packages: {files_with_compromised}")
@@ -236,6 +629,7 @@ def main():
 Examples:
   python scan.py                                    # Use defaults
   python scan.py "sbom-data/*.json"                # Custom SBOM pattern
+  python scan.py "sbom-data/*.json.gz"             # Gzipped SBOMs
   python scan.py --compromised-packages-file pkgs.txt       # Custom compromised file
   python scan.py "data/**/*.json" --compromised-packages-file security/pkgs.txt
 
@@ -265,6 +659,18 @@ Compromised packages file format:
         help='Text file containing compromised packages, one per line in format "package@version" or "@scope/package@version" (default: compromised-packages.pkg-txt)'
     )
     
+    parser.add_argument(
+        '--cache-dir',
+        default=DEFAULT_CACHE_DIR,
+        help=f'Directory to cache scan results in, so unchanged SBOM files are not parsed again (default: {DEFAULT_CACHE_DIR})'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Scan every SBOM file without reading or writing the results cache'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -274,7 +680,8 @@ Compromised packages file format:
     args = parser.parse_args()
     
     # Run the scanner
-    scan_sbom_files(args.sbom_pattern, args.compromised_packages_file)
+    scan_sbom_files(args.sbom_pattern, args.compromised_packages_file,
+                    cache_dir=None if args.no_cache else args.cache_dir)
 
 
 if __name__ == "__main__":
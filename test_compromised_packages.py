@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test file for the compromised packages list converter using unittest framework
+
+Tests that the string-method and regex parsers extract the same packages.
+"""
+
+import os
+import sys
+import unittest
+
+# Add the current directory to the path so we can import the converter
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from compromised_packages import parse_package, parse_package_strict
+
+
+class TestParsePackage(unittest.TestCase):
+    """Test cases for parsing lines of the compromised packages list."""
+
+    SAMPLE_LINES = {
+        '@ctrl/tinycolor@4.1.1': '@ctrl/tinycolor@4.1.1',
+        '@ctrl/tinycolor:4.1.1': '@ctrl/tinycolor@4.1.1',
+        'angulartics2@14.1.2, 14.1.1': 'angulartics2@14.1.2',
+        'ngx-bootstrap:18.1.4 (also 19.0.3)': 'ngx-bootstrap@18.1.4',
+        'rxnt-authentication@0.0.3\t# note': 'rxnt-authentication@0.0.3',
+        '- foo@1.0': 'foo@1.0',
+        ' ': None,
+        'no-version': None,
+        '@scope/no-version': None,
+        'empty-version@': None,
+    }
+
+    def test_parse_package(self):
+        """Test extracting package@version from sample lines."""
+        for line, expected in self.SAMPLE_LINES.items():
+            with self.subTest(line=line):
+                self.assertEqual(parse_package(line), expected)
+
+    def test_parsers_agree(self):
+        """Test that the string-method parser matches the --strict regex parser."""
+        for line in self.SAMPLE_LINES:
+            with self.subTest(line=line):
+                self.assertEqual(parse_package(line), parse_package_strict(line))
+
+
+if __name__ == "__main__":
+    # Run the tests with verbose output
+    unittest.main(verbosity=2)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test file for the repository lister using unittest framework
+
+Tests paging through an organization's repositories against canned GitHub API responses.
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+# Add the current directory to the path so we can import the lister
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import repo_lister
+from repo_lister import get_all_repos, get_last_page, load_page_cache
+
+REPOS_URL = 'https://api.github.com/orgs/owner/repos'
+
+
+def make_repo(name):
+    """Helper function to create a repository as returned by the GitHub API."""
+    return {
+        'name': name,
+        'archived': False,
+        'private': False,
+        'fork': False,
+        'created_at': '2025-01-01T00:00:00Z',
+        'updated_at': '2025-01-02T00:00:00Z',
+        'language': 'Python',
+        'size': 1
+    }
+
+
+def make_response(status_code, body=None, headers=None):
+    """Helper function to create a GitHub API response."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = REPOS_URL
+    response.headers.update(headers or {})
+    response._content = json.dumps(body).encode('utf-8') if body is not None else b''
+    return response
+
+
+class FakeSession:
+    """Session that returns canned responses by page number and records the requests made."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None):
+        with self.lock:
+            self.requests.append((params['page'], headers or {}))
+        return self.responses[params['page']]
+
+
+class TestGetAllRepos(unittest.TestCase):
+    """Test cases for fetching all of an organization's repositories."""
+
+    def setUp(self):
+        # The lister reports each page it fetches
+        stdout_patcher = mock.patch('sys.stdout', new_callable=io.StringIO)
+        stdout_patcher.start()
+        self.addCleanup(stdout_patcher.stop)
+
+    def link_header(self, last_page):
+        """Helper method to create a Link header pointing at the next and last pages."""
+        return {'Link': f'<{REPOS_URL}?per_page=100&page=2>; rel="next", '
+                        f'<{REPOS_URL}?per_page=100&page={last_page}>; rel="last"'}
+
+    def test_get_last_page(self):
+        """Test reading the last page number from the Link header."""
+        self.assertEqual(get_last_page(make_response(200, [], self.link_header(7))), 7)
+        self.assertIsNone(get_last_page(make_response(200, [])))
+
+    def test_get_all_repos_with_link_header(self):
+        """Test that the pages after the first are all fetched, and kept in page order."""
+        session = FakeSession({
+            1: make_response(200, [make_repo('a1'), make_repo('a2')], self.link_header(3)),
+            2: make_response(200, [make_repo('b1'), make_repo('b2')]),
+            3: make_response(200, [make_repo('c1')]),
+        })
+
+        repos = get_all_repos('owner', session)
+
+        self.assertEqual([repo['name'] for repo in repos], ['a1', 'a2', 'b1', 'b2', 'c1'])
+        self.assertEqual(sorted(page for page, _ in session.requests), [1, 2, 3])
+
+    def test_get_all_repos_without_link_header(self):
+        """Test that pages are fetched one at a time until a short page when there is no Link header."""
+        session = FakeSession({
+            1: make_response(200, [make_repo('a1'), make_repo('a2')]),
+            2: make_response(200, [make_repo('b1')]),
+        })
+
+        with mock.patch.object(repo_lister, 'PER_PAGE', 2):
+            repos = get_all_repos('owner', session)
+
+        self.assertEqual([repo['name'] for repo in repos], ['a1', 'a2', 'b1'])
+        self.assertEqual([page for page, _ in session.requests], [1, 2])
+
+    def test_get_all_repos_stops_at_failed_page(self):
+        """Test that a failed page keeps the repositories from the pages before it, but none after."""
+        session = FakeSession({
+            1: make_response(200, [make_repo('a1')], self.link_header(3)),
+            2: make_response(500, {'message': 'Server Error'}),
+            3: make_response(200, [make_repo('c1')]),
+        })
+
+        repos = get_all_repos('owner', session)
+
+        self.assertEqual([repo['name'] for repo in repos], ['a1'])
+
+    def test_get_all_repos_saves_page_etags(self):
+        """Test that pages with an ETag are cached with their repositories, and pages without one aren't."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_file = os.path.join(temp_dir, 'repos_owner.etags.json')
+            session = FakeSession({
+                1: make_response(200, [make_repo('a1')], {'ETag': '"etag-1"'}),
+                2: make_response(200, []),
+            })
+
+            with mock.patch.object(repo_lister, 'PER_PAGE', 1):
+                get_all_repos('owner', session, cache_file)
+
+            self.assertEqual([headers for _, headers in session.requests], [{}, {}])
+            self.assertEqual(load_page_cache(cache_file), {'1': {'etag': '"etag-1"', 'repos': [make_repo('a1')]}})
+
+    def test_get_all_repos_reuses_unchanged_pages(self):
+        """Test that cached pages are requested with If-None-Match, and reused when unchanged."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_file = os.path.join(temp_dir, 'repos_owner.etags.json')
+            page_cache = {'1': {'etag': '"etag-1"', 'repos': [make_repo('cached')]}}
+            repo_lister.save_page_cache(cache_file, page_cache)
+            session = FakeSession({1: make_response(304)})
+
+            repos = get_all_repos('owner', session, cache_file)
+
+            self.assertEqual(session.requests, [(1, {'If-None-Match': '"etag-1"'})])
+            self.assertEqual(repos, [make_repo('cached')])
+            self.assertEqual(load_page_cache(cache_file), page_cache)
+
+
+if __name__ == "__main__":
+    # Run the tests with verbose output
+    unittest.main(verbosity=2)
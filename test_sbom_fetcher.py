@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test file for the SBOM fetcher using unittest framework
+
+Tests fetching SBOMs against canned GitHub API responses.
+"""
+
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import requests
+import urllib3
+
+# Add the current directory to the path so we can import the fetcher
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import scan
+from sbom_fetcher import fetch_sbom
+
+
+class TestFetchSBOM(unittest.TestCase):
+    """Test cases for fetching SBOMs from the GitHub API."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_file = Path(self.temp_dir.name) / 'sbom_repo.json'
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_session(self, status_code, body, content_encoding=None):
+        """Helper method to create a session whose get() returns a streamed response."""
+        content = json.dumps(body).encode('utf-8')
+        headers = {}
+        if content_encoding == 'gzip':
+            content = gzip.compress(content)
+            headers['Content-Encoding'] = 'gzip'
+        self.content = content
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = 'https://api.github.com/repos/owner/repo/dependency-graph/sbom'
+        response.headers.update(headers)
+        response.raw = urllib3.HTTPResponse(body=io.BytesIO(content), headers=headers, status=status_code,
+                                            preload_content=False, decode_content=False)
+        session = mock.Mock()
+        session.get.return_value = response
+        return session
+
+    def test_fetch_sbom_saves_response(self):
+        """Test that a successful response is saved to the output file."""
+        session = self.create_session(200, {'sbom': {'packages': []}})
+
+        result = fetch_sbom('owner', 'repo', session, self.output_file)
+
+        self.assertEqual(result, (True, None))
+        self.assertEqual(json.loads(self.output_file.read_text()), {'sbom': {'packages': []}})
+
+    def test_fetch_sbom_compressed(self):
+        """Test saving a .json.gz SBOM, whether or not GitHub sent the body gzipped."""
+        sbom = {'sbom': {'packages': [{'name': 'pkg', 'versionInfo': '1.0.0'}]}}
+        output_file = self.output_file.with_name('sbom_repo.json.gz')
+
+        for content_encoding in ('gzip', None):
+            with self.subTest(content_encoding=content_encoding):
+                session = self.create_session(200, sbom, content_encoding)
+
+                result = fetch_sbom('owner', 'repo', session, output_file)
+
+                self.assertEqual(result, (True, None))
+                if content_encoding == 'gzip':
+                    # Saved as it arrived, without being decompressed and compressed again
+                    self.assertEqual(output_file.read_bytes(), self.content)
+                with gzip.open(output_file, 'rb') as f:
+                    self.assertEqual(json.load(f), sbom)
+                self.assertEqual(scan.parse_sbom_file(str(output_file)), [('pkg', '1.0.0')])
+
+    def test_fetch_sbom_timeout(self):
+        """Test that a 500 saying GitHub timed out is reported as a timeout, so Syft can be tried."""
+        session = self.create_session(500, {'message': 'Request timed out while generating the SBOM'})
+
+        result = fetch_sbom('owner', 'repo', session, self.output_file)
+
+        self.assertEqual(result, (False, 'timeout'))
+        self.assertFalse(self.output_file.exists())
+
+    def test_fetch_sbom_other_error(self):
+        """Test that other error responses are reported as errors."""
+        session = self.create_session(500, {'message': 'Something went wrong'})
+
+        with mock.patch('sys.stdout', new_callable=io.StringIO):
+            result = fetch_sbom('owner', 'repo', session, self.output_file)
+
+        self.assertEqual(result, (False, 'error'))
+        self.assertFalse(self.output_file.exists())
+
+
+if __name__ == "__main__":
+    # Run the tests with verbose output
+    unittest.main(verbosity=2)
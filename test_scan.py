@@ -5,17 +5,22 @@ Test file for SBOM Package Scanner using unittest framework
 Tests the scanner with example SBOM and compromised packages files.
 """
 
+import gzip
+import io
 import json
 import tempfile
 import os
 import sys
 import unittest
+import uuid
 from pathlib import Path
+from unittest import mock
 
 # Add the current directory to the path so we can import the scanner
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from scan import load_compromised_packages, parse_sbom_file, compare_packages_in_sbom_to_compromised_packages
+import scan
+from scan import load_compromised_packages, parse_sbom_file, compare_packages_in_sbom_to_compromised_packages, scan_sbom_file, scan_many
 
 
 class TestSBOMScanner(unittest.TestCase):
@@ -188,110 +193,226 @@ ljharb/actions@main
 typed-array-byte-offset@1.0.2
 some-other-action@v1"""
 
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        # Create temporary files for each test
-        self.temp_files = []
+    @classmethod
+    def setUpClass(cls):
+        """Serialize the example SBOMs and write the shared fixture files once."""
+        cls.EXAMPLE_SBOM_JSON = json.dumps(cls.EXAMPLE_SBOM).encode('utf-8')
+        cls.EXAMPLE_SYFT_SBOM_JSON = json.dumps(cls.EXAMPLE_SYFT_SBOM).encode('utf-8')
+        
+        # Use memory-backed /dev/shm where there is one
+        cls.temp_dir = tempfile.TemporaryDirectory(dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+        
+        # Read-only fixtures shared by the tests; tests that modify a file create their own
+        cls.sbom_path = cls.create_temp_file(cls.EXAMPLE_SBOM_JSON, suffix='.json')
+        cls.syft_path = cls.create_temp_file(cls.EXAMPLE_SYFT_SBOM_JSON, suffix='.json')
+        cls.comp_path = cls.create_temp_file(cls.COMPROMISED_PACKAGES)
+        cls.comp_syft_path = cls.create_temp_file(cls.COMPROMISED_PACKAGES_SYFT)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the temporary files created during the tests."""
+        cls.temp_dir.cleanup()
     
-    def tearDown(self):
-        """Clean up after each test method."""
-        # Remove any temporary files created during tests
-        for temp_file in self.temp_files:
+    @classmethod
+    def create_temp_file(cls, content, suffix='.txt', mode='w'):
+        """Helper method to create temporary files. Bytes are written as they are."""
+        temp_path = os.path.join(cls.temp_dir.name, f"{uuid.uuid4().hex}{suffix}")
+        if isinstance(content, bytes):
+            # Write pre-serialized fixtures with a single write() call
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
             try:
-                os.unlink(temp_file)
-            except FileNotFoundError:
-                pass
-    
-    def create_temp_file(self, content, suffix='.txt', mode='w'):
-        """Helper method to create temporary files."""
-        with tempfile.NamedTemporaryFile(mode=mode, delete=False, suffix=suffix) as f:
+                os.write(fd, content)
+            finally:
+                os.close(fd)
+            return temp_path
+        with open(temp_path, mode) as f:
             if isinstance(content, dict):
                 json.dump(content, f)
             else:
                 f.write(content)
-            temp_path = f.name
         
-        self.temp_files.append(temp_path)
         return temp_path
 
     def test_load_compromised_packages(self):
         """Test loading compromised packages from a file."""
-        temp_file = self.create_temp_file(self.COMPROMISED_PACKAGES)
-        
-        compromised = load_compromised_packages(temp_file)
+        compromised = load_compromised_packages(self.comp_path)
         
         # Should load 4 compromised packages
         self.assertEqual(len(compromised), 4, f"Expected 4 compromised packages, got {len(compromised)}")
         
         # Check specific packages are loaded
         expected_packages = {
-            'typed-array-byte-offset@1.0.2',
-            '@pkgjs/parseargs@0.11.0',
-            'some-other-package@1.0.0',
-            'another-compromised@2.0.1'
+            'typed-array-byte-offset': {'1.0.2'},
+            '@pkgjs/parseargs': {'0.11.0'},
+            'some-other-package': {'1.0.0'},
+            'another-compromised': {'2.0.1'}
         }
         self.assertEqual(compromised, expected_packages, f"Compromised packages don't match: {compromised}")
 
+    def test_load_compromised_packages_skips_comments_and_unversioned(self):
+        """Test that comments, blank lines and lines without a version are ignored."""
+        temp_file = self.create_temp_file("# comment\n\n@scope/no-version\nplain-name\n@scope/pkg@1.0.0\n")
+        
+        compromised = load_compromised_packages(temp_file)
+        
+        self.assertEqual(compromised, {'@scope/pkg': {'1.0.0'}})
+
+    def test_load_compromised_packages_cached_until_file_changes(self):
+        """Test that an unchanged file is loaded once, and a changed file is loaded again."""
+        temp_file = self.create_temp_file("pkg@1.0.0\n")
+        
+        first = load_compromised_packages(temp_file)
+        self.assertIs(load_compromised_packages(temp_file), first)
+        
+        with open(temp_file, 'a') as f:
+            f.write("pkg@1.0.1\n")
+        
+        self.assertEqual(load_compromised_packages(temp_file), {'pkg': {'1.0.0', '1.0.1'}})
+
+    def test_load_compromised_packages_groups_versions(self):
+        """Test that several compromised versions of one package are grouped under its name."""
+        temp_file = self.create_temp_file("pkg@1.0.0\npkg@1.0.1\n@scope/pkg@2.0.0\n")
+        
+        compromised = load_compromised_packages(temp_file)
+        
+        self.assertEqual(compromised, {'pkg': {'1.0.0', '1.0.1'}, '@scope/pkg': {'2.0.0'}})
+
     def test_parse_sbom_file(self):
         """Test parsing SBOM file."""
-        temp_file = self.create_temp_file(self.EXAMPLE_SBOM, suffix='.json')
-        
-        packages = parse_sbom_file(temp_file)
+        packages = parse_sbom_file(self.sbom_path)
         
         # Should parse 4 packages
         self.assertEqual(len(packages), 4, f"Expected 4 packages, got {len(packages)}")
         
         # Check specific packages
-        expected_packages = [
-            {'name': 'typed-array-byte-offset', 'version': '1.0.2'},
-            {'name': 'eslint-scope', 'version': '7.2.2'},
-            {'name': '@pkgjs/parseargs', 'version': '0.11.0'},
-            {'name': '@csstools/media-query-list-parser', 'version': '4.0.3'}
+        expected_packages = {
+            ('typed-array-byte-offset', '1.0.2'),
+            ('eslint-scope', '7.2.2'),
+            ('@pkgjs/parseargs', '0.11.0'),
+            ('@csstools/media-query-list-parser', '4.0.3')
+        }
+        
+        # Order doesn't matter, and the length check above catches duplicates
+        self.assertEqual(set(packages), expected_packages, f"Packages don't match: {packages}")
+
+    @unittest.skipIf(scan.ijson is None, "ijson is not installed")
+    def test_parse_sbom_file_streaming(self):
+        """Test parsing SBOM files with ijson, as is done for large files."""
+        sbom_path = self.create_temp_file({'sbom': self.EXAMPLE_SBOM}, suffix='.json')
+        
+        with mock.patch.object(scan, 'STREAMING_THRESHOLD', 0):
+            packages = parse_sbom_file(sbom_path)
+            syft_packages = parse_sbom_file(self.syft_path)
+        
+        self.assertEqual(len(packages), 4, f"Expected 4 packages, got {len(packages)}")
+        self.assertEqual(len(syft_packages), 7, f"Expected 7 packages, got {len(syft_packages)}")
+
+    @unittest.skipIf(scan.ijson is None, "ijson is not installed")
+    def test_sbom_format_stops_at_first_format_key(self):
+        """Test that finding the SBOM format doesn't parse the rest of the document."""
+        # Anything after a top-level format key is never read, so it needn't be valid JSON
+        self.assertEqual(scan._sbom_format(io.BytesIO(b'{"name": "x", "packages": [ not json')), ('', 'packages'))
+        self.assertEqual(scan._sbom_format(io.BytesIO(b'{"sbom": {"spdxVersion": "SPDX-2.3", "packages": []}}')),
+                         ('sbom.', 'packages'))
+        self.assertEqual(scan._sbom_format(io.BytesIO(b'{"name": "x"}')), ('', None))
+
+    @unittest.skipIf(scan.ijson is None, "ijson is not installed")
+    def test_streaming_and_loading_choose_the_same_format(self):
+        """Test that small and large files with several format keys are read the same way."""
+        manifests = {'m': {'resolved': {'pkg:npm/x@1': {}}}}
+        sboms = [
+            # The first top-level format key is used
+            ({'manifests': manifests, 'packages': [{'name': 'p', 'versionInfo': '1'}]}, [('x', '1')]),
+            # A top-level format key is used before one in the 'sbom' wrapper
+            ({'sbom': {'packages': [{'name': 'p', 'versionInfo': '1'}]},
+              'components': [{'name': 'c', 'version': '1'}]}, [('c', '1')]),
         ]
+        for sbom, expected in sboms:
+            with self.subTest(sbom=sbom):
+                sbom_path = self.create_temp_file(sbom, suffix='.json')
+                loaded = parse_sbom_file(sbom_path)
+                with mock.patch.object(scan, 'STREAMING_THRESHOLD', 0):
+                    streamed = parse_sbom_file(sbom_path)
+                self.assertEqual(loaded, expected)
+                self.assertEqual(streamed, expected)
+
+    @unittest.skipIf(scan.ijson is None, "ijson is not installed")
+    def test_parse_sbom_file_streaming_ignores_nested_fields(self):
+        """Test that streaming only takes the name and version at the top of each component."""
+        sbom_path = self.create_temp_file({'components': [
+            {'supplier': {'name': 'acme'}, 'name': 'pkg', 'properties': [{'name': 'x', 'version': '9'}], 'version': '1.0.0'},
+            {'supplier': {'name': 'acme'}, 'version': '2.0.0'},
+        ]}, suffix='.json')
+        
+        with mock.patch.object(scan, 'STREAMING_THRESHOLD', 0):
+            packages = parse_sbom_file(sbom_path)
+        
+        self.assertEqual(packages, [('pkg', '1.0.0')])
+
+    def test_parse_github_api_sbom_file(self):
+        """Test parsing an SBOM saved as the GitHub API response, wrapped in an 'sbom' key."""
+        temp_file = self.create_temp_file({'sbom': self.EXAMPLE_SBOM}, suffix='.json')
         
-        # Sort both lists for comparison
-        packages_sorted = sorted(packages, key=lambda x: x['name'])
-        expected_sorted = sorted(expected_packages, key=lambda x: x['name'])
+        packages = parse_sbom_file(temp_file)
         
-        self.assertEqual(packages_sorted, expected_sorted, f"Packages don't match: {packages_sorted}")
+        expected_packages = {
+            ('typed-array-byte-offset', '1.0.2'),
+            ('eslint-scope', '7.2.2'),
+            ('@pkgjs/parseargs', '0.11.0'),
+            ('@csstools/media-query-list-parser', '4.0.3')
+        }
+        self.assertEqual(set(packages), expected_packages)
 
-    def test_parse_syft_sbom_file(self):
-        """Test parsing Syft SBOM file (github-json format)."""
-        temp_file = self.create_temp_file(self.EXAMPLE_SYFT_SBOM, suffix='.json')
+    def test_parse_gzipped_sbom_file(self):
+        """Test parsing a gzipped SBOM file, as saved by sbom_fetcher.py --compress."""
+        content = gzip.compress(json.dumps({'sbom': self.EXAMPLE_SBOM}).encode('utf-8'))
+        temp_file = self.create_temp_file(content, suffix='.json.gz')
         
         packages = parse_sbom_file(temp_file)
         
+        self.assertEqual(len(packages), 4, f"Expected 4 packages, got {len(packages)}")
+
+    def test_gzipped_file_size_is_uncompressed_size(self):
+        """Test that gzipped SBOMs are measured uncompressed when choosing whether to stream."""
+        temp_file = self.create_temp_file(gzip.compress(self.EXAMPLE_SBOM_JSON), suffix='.json.gz')
+        
+        with scan._open_sbom(temp_file) as f:
+            self.assertEqual(scan._file_size(f), len(self.EXAMPLE_SBOM_JSON))
+            self.assertEqual(f.read(), self.EXAMPLE_SBOM_JSON)
+
+    def test_parse_syft_sbom_file(self):
+        """Test parsing Syft SBOM file (github-json format)."""
+        packages = parse_sbom_file(self.syft_path)
+        
         # Should parse 5 unique packages (some packages appear in multiple manifests)
         # actions/checkout@v2 appears twice, so we should get 5 unique packages total
-        package_strings = {f"{pkg['name']}@{pkg['version']}" for pkg in packages}
-        
         expected_packages = {
-            'actions/checkout@v2',
-            'actions/setup-node@v1', 
-            'ljharb/actions@main',
-            'typed-array-byte-offset@1.0.2',
-            '@pkgjs/parseargs@0.11.0'
+            ('actions/checkout', 'v2'),
+            ('actions/setup-node', 'v1'),
+            ('ljharb/actions', 'main'),
+            ('typed-array-byte-offset', '1.0.2'),
+            ('@pkgjs/parseargs', '0.11.0')
         }
         
-        self.assertEqual(package_strings, expected_packages, 
-                        f"Syft SBOM packages don't match expected. Got: {package_strings}")
+        self.assertEqual(set(packages), expected_packages,
+                        f"Syft SBOM packages don't match expected. Got: {packages}")
 
     def test_compare_packages_regular_and_scoped(self):
         """Test comparing SBOM packages with compromised packages (both regular and scoped)."""
         # SBOM packages
         sbom_packages = [
-            {'name': 'typed-array-byte-offset', 'version': '1.0.2'},
-            {'name': 'eslint-scope', 'version': '7.2.2'},
-            {'name': '@pkgjs/parseargs', 'version': '0.11.0'},
-            {'name': '@csstools/media-query-list-parser', 'version': '4.0.3'}
+            ('typed-array-byte-offset', '1.0.2'),
+            ('eslint-scope', '7.2.2'),
+            ('@pkgjs/parseargs', '0.11.0'),
+            ('@csstools/media-query-list-parser', '4.0.3')
         ]
         
         # Compromised packages set
         compromised = {
-            'typed-array-byte-offset@1.0.2',
-            '@pkgjs/parseargs@0.11.0',
-            'some-other-package@1.0.0',
-            'another-compromised@2.0.1'
+            'typed-array-byte-offset': frozenset({'1.0.2'}),
+            '@pkgjs/parseargs': frozenset({'0.11.0'}),
+            'some-other-package': frozenset({'1.0.0'}),
+            'another-compromised': frozenset({'2.0.1'})
         }
         
         # Find matches
@@ -301,26 +422,32 @@ some-other-action@v1"""
         self.assertEqual(len(compromised_found), 2, f"Expected 2 compromised packages, got {len(compromised_found)}")
         
         # Check the specific matches
-        expected_matches = [
+        expected_matches = {
             ('typed-array-byte-offset', '1.0.2'),
             ('@pkgjs/parseargs', '0.11.0')
-        ]
-        
-        compromised_found_sorted = sorted(compromised_found)
-        expected_matches_sorted = sorted(expected_matches)
+        }
         
-        self.assertEqual(compromised_found_sorted, expected_matches_sorted, 
-                        f"Compromised matches don't match: {compromised_found_sorted}")
+        self.assertEqual(set(compromised_found), expected_matches,
+                        f"Compromised matches don't match: {compromised_found}")
+
+    def test_compare_packages_streamed_from_sbom(self):
+        """Test matching packages as they are streamed from an SBOM file."""
+        with open(self.sbom_path, 'rb') as f:
+            compromised_found = compare_packages_in_sbom_to_compromised_packages(
+                scan.iter_sbom_packages(f), load_compromised_packages(self.comp_path))
+        
+        self.assertEqual(set(compromised_found),
+                         {('typed-array-byte-offset', '1.0.2'), ('@pkgjs/parseargs', '0.11.0')})
 
     def test_scoped_package_handling(self):
         """Test that scoped packages are handled correctly."""
         # Test with only scoped packages
         sbom_packages = [
-            {'name': '@pkgjs/parseargs', 'version': '0.11.0'},
-            {'name': '@csstools/media-query-list-parser', 'version': '4.0.3'}
+            ('@pkgjs/parseargs', '0.11.0'),
+            ('@csstools/media-query-list-parser', '4.0.3')
         ]
         
-        compromised = {'@pkgjs/parseargs@0.11.0'}
+        compromised = {'@pkgjs/parseargs': frozenset({'0.11.0'})}
         
         compromised_found = compare_packages_in_sbom_to_compromised_packages(sbom_packages, compromised)
         
@@ -329,15 +456,11 @@ some-other-action@v1"""
 
     def test_syft_format_integration(self):
         """Test the complete end-to-end flow with Syft SBOM format."""
-        # Create temporary files
-        sbom_path = self.create_temp_file(self.EXAMPLE_SYFT_SBOM, suffix='.json')
-        comp_path = self.create_temp_file(self.COMPROMISED_PACKAGES_SYFT)
-        
         # Load compromised packages
-        compromised = load_compromised_packages(comp_path)
+        compromised = load_compromised_packages(self.comp_syft_path)
         
         # Parse Syft SBOM
-        packages = parse_sbom_file(sbom_path)
+        packages = parse_sbom_file(self.syft_path)
         
         # Compare
         compromised_found = compare_packages_in_sbom_to_compromised_packages(packages, compromised)
@@ -350,22 +473,21 @@ some-other-action@v1"""
                         f"Expected 5 compromised packages, got {len(compromised_found)}: {compromised_found}")
         
         # Verify the specific compromised packages (deduplicated for comparison)
-        compromised_package_strings = {f'{name}@{version}' for name, version in compromised_found}
         expected_compromised = {
-            'actions/checkout@v2', 
-            'ljharb/actions@main',
-            'typed-array-byte-offset@1.0.2'
+            ('actions/checkout', 'v2'),
+            ('ljharb/actions', 'main'),
+            ('typed-array-byte-offset', '1.0.2')
         }
-        self.assertEqual(compromised_package_strings, expected_compromised,
-                        f"Syft compromised packages don't match. Got: {compromised_package_strings}")
+        self.assertEqual(set(compromised_found), expected_compromised,
+                        f"Syft compromised packages don't match. Got: {compromised_found}")
         
         # Also test that we have the right counts of each
         from collections import Counter
-        package_counts = Counter(f'{name}@{version}' for name, version in compromised_found)
+        package_counts = Counter(compromised_found)
         expected_counts = {
-            'actions/checkout@v2': 2,  # appears in 2 manifests
-            'ljharb/actions@main': 2,  # appears with 2 different fragments
-            'typed-array-byte-offset@1.0.2': 1
+            ('actions/checkout', 'v2'): 2,  # appears in 2 manifests
+            ('ljharb/actions', 'main'): 2,  # appears with 2 different fragments
+            ('typed-array-byte-offset', '1.0.2'): 1
         }
         self.assertEqual(dict(package_counts), expected_counts,
                         f"Package counts don't match. Got: {dict(package_counts)}")
@@ -401,26 +523,47 @@ some-other-action@v1"""
         
         # Both should be parsed as ljharb/actions@main (fragments removed)
         expected_packages = [
-            {'name': 'ljharb/actions', 'version': 'main'},
-            {'name': 'ljharb/actions', 'version': 'main'}
+            ('ljharb/actions', 'main'),
+            ('ljharb/actions', 'main')
         ]
         
         self.assertEqual(len(packages), 2, f"Expected 2 packages, got {len(packages)}")
-        for pkg in packages:
-            self.assertEqual(pkg['name'], 'ljharb/actions')
-            self.assertEqual(pkg['version'], 'main')
+        self.assertEqual(packages, expected_packages)
+
+    def test_syft_package_url_parsing(self):
+        """Test that Syft package URLs with encoded scopes, no type or no version are handled."""
+        syft_sbom = {
+            "manifests": {
+                "package.json": {
+                    "resolved": {
+                        "pkg:npm/%40pkgjs/parseargs@0.11.0": {},
+                        "pkg:npm/@csstools/media-query-list-parser@4.0.3": {},
+                        "pkg:untyped@1.0.0": {},
+                        "pkg:npm/no-version": {},
+                        "pkg:npm/@scope/no-version": {},
+                        "pkg:npm/empty-version@": {},
+                        "not-a-package-url@1.0.0": {}
+                    }
+                }
+            }
+        }
+        
+        temp_file = self.create_temp_file(syft_sbom, suffix='.json')
+        packages = parse_sbom_file(temp_file)
+        
+        self.assertEqual(sorted(packages), [
+            ('@csstools/media-query-list-parser', '4.0.3'),
+            ('@pkgjs/parseargs', '0.11.0'),
+            ('untyped', '1.0.0')
+        ])
 
     def test_end_to_end_integration(self):
         """Test the complete end-to-end flow that finds 2 out of 4 dependencies compromised."""
-        # Create temporary files
-        sbom_path = self.create_temp_file(self.EXAMPLE_SBOM, suffix='.json')
-        comp_path = self.create_temp_file(self.COMPROMISED_PACKAGES)
-        
         # Load compromised packages
-        compromised = load_compromised_packages(comp_path)
+        compromised = load_compromised_packages(self.comp_path)
         
         # Parse SBOM
-        packages = parse_sbom_file(sbom_path)
+        packages = parse_sbom_file(self.sbom_path)
         
         # Compare
         compromised_found = compare_packages_in_sbom_to_compromised_packages(packages, compromised)
@@ -430,9 +573,101 @@ some-other-action@v1"""
         self.assertEqual(len(compromised_found), 2, f"Expected 2 compromised packages, got {len(compromised_found)}")
         
         # Verify the specific compromised packages
-        compromised_package_strings = {f'{name}@{version}' for name, version in compromised_found}
-        expected_compromised = {'typed-array-byte-offset@1.0.2', '@pkgjs/parseargs@0.11.0'}
-        self.assertEqual(compromised_package_strings, expected_compromised)
+        expected_compromised = {('typed-array-byte-offset', '1.0.2'), ('@pkgjs/parseargs', '0.11.0')}
+        self.assertEqual(set(compromised_found), expected_compromised)
+
+    def test_scan_sbom_file(self):
+        """Test counting and matching packages in a single pass over an SBOM file."""
+        package_count, compromised_found = scan_sbom_file(self.sbom_path, load_compromised_packages(self.comp_path))
+        
+        self.assertEqual(package_count, 4)
+        self.assertEqual(sorted(compromised_found),
+                         [('@pkgjs/parseargs', '0.11.0'), ('typed-array-byte-offset', '1.0.2')])
+
+    def test_scan_many(self):
+        """Test scanning several SBOM files in parallel, with results in input order."""
+        results = scan_many([self.sbom_path, self.syft_path], load_compromised_packages(self.comp_path), max_workers=2)
+        
+        self.assertEqual([package_count for package_count, _ in results], [4, 7])
+        self.assertEqual(sorted(results[0][1]),
+                         [('@pkgjs/parseargs', '0.11.0'), ('typed-array-byte-offset', '1.0.2')])
+        self.assertEqual(sorted(results[1][1]),
+                         [('@pkgjs/parseargs', '0.11.0'), ('typed-array-byte-offset', '1.0.2')])
+
+    def test_scan_sbom_files_report(self):
+        """Test the CLI report: files in sorted order, errors under their file, and the totals."""
+        sbom_dir = tempfile.mkdtemp(dir=self.temp_dir.name)
+        for file_name, content in [('c.json', self.EXAMPLE_SYFT_SBOM_JSON), ('a.json', self.EXAMPLE_SBOM_JSON),
+                                   ('b.json', b'{')]:
+            with open(os.path.join(sbom_dir, file_name), 'wb') as f:
+                f.write(content)
+        
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            with self.assertRaises(SystemExit) as exit_context:
+                scan.scan_sbom_files(os.path.join(sbom_dir, '*.json'), self.comp_path, cache_dir=None)
+        
+        self.assertEqual(exit_context.exception.code, 1)
+        lines = stdout.getvalue().splitlines()
+        scanned = [line for line in lines if line.startswith('Scanning: ')]
+        self.assertEqual(scanned, [f"Scanning: {os.path.join(sbom_dir, name)}" for name in ('a.json', 'b.json', 'c.json')])
+        error_line = lines[lines.index(scanned[1]) + 1]
+        self.assertTrue(error_line.startswith(f"Error parsing JSON file '{os.path.join(sbom_dir, 'b.json')}'"), error_line)
+        self.assertIn("SBOM files (repos) scanned: 3", lines)
+        self.assertIn("Total packages in SBOMs: 11", lines)
+        self.assertIn("Files with compromised packages: 2", lines)
+        self.assertIn("Total compromised packages found: 4", lines)
+
+    def test_scan_result_cache_errors_fall_back_to_scanning(self):
+        """Test that corrupt or unwritable cache entries don't stop a file being scanned."""
+        cache_dir = tempfile.mkdtemp(dir=self.temp_dir.name)
+        compromised = load_compromised_packages(self.comp_path)
+        scan._init_worker(compromised, scan._compromised_sha256(compromised), cache_dir)
+        self.addCleanup(scan._init_worker, {}, '', None)
+        
+        # A corrupt entry is ignored, and replaced by the new result
+        scan._scan_one(self.sbom_path)
+        (cache_file,) = Path(cache_dir).iterdir()
+        cache_file.write_text('{"packages": ')
+        self.assertEqual(scan._scan_one(self.sbom_path)[1:], (4, 2))
+        self.assertEqual(json.loads(cache_file.read_text())['packages'], 4)
+        
+        # A result that can't be written is still reported
+        cache_file.unlink()
+        with mock.patch.object(Path, 'write_text', side_effect=PermissionError("read-only")):
+            self.assertEqual(scan._scan_one(self.sbom_path)[1:], (4, 2))
+        self.assertEqual(list(Path(cache_dir).iterdir()), [])
+
+    def test_scan_sbom_files_creates_nested_cache_dir(self):
+        """Test that a cache directory is created along with any missing parents."""
+        cache_dir = os.path.join(tempfile.mkdtemp(dir=self.temp_dir.name), 'nested', 'cache')
+        
+        with mock.patch('sys.stdout', new_callable=io.StringIO):
+            with self.assertRaises(SystemExit):
+                scan.scan_sbom_files(self.sbom_path, self.comp_path, cache_dir=cache_dir)
+        
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_scan_result_cache(self):
+        """Test that scan results are cached, and not reused once the scanner changes."""
+        cache_dir = tempfile.mkdtemp(dir=self.temp_dir.name)
+        compromised = load_compromised_packages(self.comp_path)
+        scan._init_worker(compromised, scan._compromised_sha256(compromised), cache_dir)
+        self.addCleanup(scan._init_worker, {}, '', None)
+        
+        # Miss: the file is parsed and its result written to the cache
+        report, package_count, compromised_count = scan._scan_one(self.sbom_path)
+        self.assertEqual((package_count, compromised_count), (4, 2))
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        
+        # Hit: the cached result is reported without parsing the file
+        with mock.patch.object(scan, 'iter_sbom_packages', side_effect=AssertionError("file was parsed")):
+            self.assertEqual(scan._scan_one(self.sbom_path), (report, 4, 2))
+        
+        # A changed scanner doesn't reuse the cached result
+        with mock.patch.object(scan, '_scanner_sha256', return_value='0' * 64), \
+             mock.patch.object(scan, 'iter_sbom_packages', return_value=iter([('typed-array-byte-offset', '1.0.2')])):
+            self.assertEqual(scan._scan_one(self.sbom_path)[1:], (1, 1))
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
 
 
 if __name__ == "__main__":